@@ -4,26 +4,39 @@ Script to download the Objathor CLIP/SBERT embeddings from AllenAI.
 
 import os
 from pathlib import Path
+
+# Use the Rust-based hf_transfer backend when available; it parallelizes
+# chunked downloads and is much faster than the default on fast links.
+# huggingface_hub snapshots this env var at import time, so it must be set
+# before the import below.
+try:
+    import hf_transfer  # noqa: F401
+
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+except ImportError:
+    pass
+
 from huggingface_hub import snapshot_download
 from dotenv import load_dotenv
 
 
 def main():
     load_dotenv()
-    
+
     local_dir = Path(__file__).parent
     cache_dir = os.getenv("CACHE_DIR", os.path.expanduser("~/.cache/huggingface/hub"))
-        
+
     repo_id = "yunho-c/objathor-assets"
     repo_type = "dataset"
-        
+
     try:
-        
+
         kwargs = {
             "repo_id": repo_id,
             "repo_type": repo_type,
             "local_dir": local_dir,
             "cache_dir": cache_dir,
+            "max_workers": 8,
         }
         
         downloaded_path = snapshot_download(**kwargs)
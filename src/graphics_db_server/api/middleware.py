@@ -0,0 +1,62 @@
+"""
+Admission control for inference-heavy endpoints.
+
+Unbounded concurrent CLIP/SBERT encodes can exhaust GPU/CPU memory and
+degrade every in-flight request. This middleware caps how many protected
+requests run at once; excess requests queue briefly and then get a clean 503
+instead of piling up.
+"""
+
+import asyncio
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+
+
+class AdmissionControlMiddleware(BaseHTTPMiddleware):
+    """
+    Limits concurrency on the given path prefixes.
+
+    Args:
+        app: The ASGI app.
+        paths: Path prefixes to protect.
+        exclude_paths: Prefixes exempted even when they match a protected
+            prefix — for cheap routes nested under an expensive one.
+        max_concurrent: How many protected requests may run at once.
+        queue_timeout: Seconds a request may wait for a slot before 503.
+    """
+
+    def __init__(
+        self,
+        app,
+        paths: list[str],
+        exclude_paths: list[str] | None = None,
+        max_concurrent: int = 8,
+        queue_timeout: float = 5.0,
+    ):
+        super().__init__(app)
+        self.paths = tuple(paths)
+        self.exclude_paths = tuple(exclude_paths or ())
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def dispatch(self, request, call_next):
+        path = request.url.path
+        if not path.startswith(self.paths) or (
+            self.exclude_paths and path.startswith(self.exclude_paths)
+        ):
+            return await call_next(request)
+
+        try:
+            await asyncio.wait_for(
+                self._semaphore.acquire(), timeout=self.queue_timeout
+            )
+        except asyncio.TimeoutError:
+            return JSONResponse(
+                status_code=503,
+                content={"detail": "Server is at capacity, retry later"},
+            )
+        try:
+            return await call_next(request)
+        finally:
+            self._semaphore.release()
@@ -1,17 +1,28 @@
-import base64
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse, FileResponse
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, FileResponse, Response
+from pydantic import BaseModel, ConfigDict
 
-from graphics_db_server.core.config import SCALE_MAX_LENGTH_THRESHOLD
-from graphics_db_server.db.session import get_db_connection
+from graphics_db_server.core.config import (
+    EMBEDDING_DIMS,
+    GLB_ACCEL_REDIRECT_PREFIX,
+    SCALE_MAX_LENGTH_THRESHOLD,
+)
+from graphics_db_server.cache.proximity import ProximityCache
+from graphics_db_server.db.session import get_async_db_connection
 from graphics_db_server.db import crud
+from graphics_db_server.embeddings.batcher import AsyncBatcher
 from graphics_db_server.embeddings.clip import get_clip_embeddings
 from graphics_db_server.embeddings.sbert import get_sbert_embeddings
 from graphics_db_server.logging import logger
 from graphics_db_server.schemas.asset import Asset
 from graphics_db_server.sources.from_objaverse import (
-    download_assets,
+    download_assets_coalesced,
     get_thumbnails,
 )
 from graphics_db_server.utils.asset_validation import validate_asset_scales
@@ -19,106 +30,329 @@ from graphics_db_server.utils.geometry import get_glb_dimensions
 
 router = APIRouter()
 
+# Thumbnails and GLBs are addressed by immutable UIDs, so clients and any
+# intermediary cache can keep them for a year without revalidating.
+_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Coalesce queries from concurrent requests into single forward passes.
+clip_batcher = AsyncBatcher(get_clip_embeddings)
+sbert_batcher = AsyncBatcher(get_sbert_embeddings)
+
+# Short-TTL cache of full search responses, keyed by all query params.
+SEARCH_CACHE_TTL = 60.0
+SEARCH_CACHE_SIZE = 1024
+_search_cache: OrderedDict[tuple, tuple[float, list[dict]]] = OrderedDict()
+
+# Second-level cache for near-identical queries ("red chair" vs "a red
+# chair"): matches on CLIP-embedding similarity after the exact-text cache
+# misses, keyed per top_k so result counts stay consistent. LRU-capped like
+# _search_cache — top_k is client-supplied, so distinct values must not
+# allocate caches without bound.
+PROXIMITY_CACHES_SIZE = 8
+_proximity_caches: OrderedDict[int, ProximityCache] = OrderedDict()
+
+# Scale validation runs as background jobs; GLB dimensions are immutable, so
+# per-uid verdicts are cached forever and future jobs short-circuit.
+VALIDATION_JOBS_SIZE = 256
+_validation_jobs: OrderedDict[str, dict] = OrderedDict()
+_scale_cache: dict[str, bool] = {}
+
+# The event loop only weakly references tasks; hold them here so a running
+# validation job can't be garbage-collected mid-flight.
+_validation_tasks: set[asyncio.Task] = set()
+
+
+async def _run_scale_validation(job_id: str, results: list[dict]):
+    job = _validation_jobs.get(job_id)
+    if job is None:
+        # Evicted before the task ran; there's no job entry left to update.
+        return
+    try:
+        uncached_uids = [a["uid"] for a in results if a["uid"] not in _scale_cache]
+        if uncached_uids:
+            asset_paths = await download_assets_coalesced(uncached_uids)
+            validation_results = await asyncio.to_thread(
+                validate_asset_scales, asset_paths, SCALE_MAX_LENGTH_THRESHOLD
+            )
+            _scale_cache.update(validation_results)
+        job["results"] = [a for a in results if _scale_cache.get(a["uid"], False)]
+        job["status"] = "done"
+    except Exception as e:
+        logger.error(f"Scale validation job {job_id} failed: {e}")
+        job["status"] = "failed"
+
+
+
 
-@router.get("/assets/search", response_model=list[Asset])
-def search_assets(query: str, top_k: int = 5, validate_scale: bool = False):
+@router.get("/assets/search", response_model=None)
+async def search_assets(query: str, top_k: int = 5, validate_scale: bool = False):
     """
     Finds the top_k most similar assets for a given query.
+
+    With validate_scale=True, scale validation runs as a background job:
+    the response carries the unvalidated results plus a job_id to poll via
+    /assets/search/jobs/{job_id} for the validated subset.
     """
-    query_embedding_clip = get_clip_embeddings(query)
-    query_embedding_sbert = get_sbert_embeddings(query)
-    with get_db_connection() as conn:
-        results: list[dict] = crud.search_assets(
+    cache_key = (query, top_k)
+    cached = _search_cache.get(cache_key)
+    if cached is not None and time.monotonic() - cached[0] < SEARCH_CACHE_TTL:
+        _search_cache.move_to_end(cache_key)
+        results = cached[1]
+    else:
+        # Run the two CPU-heavy encoders in parallel, off the event loop. Each
+        # batcher folds concurrent requests into a single forward pass.
+        query_embedding_clip, query_embedding_sbert = await asyncio.gather(
+            clip_batcher.process(query),
+            sbert_batcher.process(query),
+        )
+        # Same TTL as the exact-text cache so the two layers age together.
+        proximity_cache = _proximity_caches.get(top_k)
+        if proximity_cache is None:
+            proximity_cache = ProximityCache(ttl=SEARCH_CACHE_TTL)
+            _proximity_caches[top_k] = proximity_cache
+            while len(_proximity_caches) > PROXIMITY_CACHES_SIZE:
+                _proximity_caches.popitem(last=False)
+        else:
+            _proximity_caches.move_to_end(top_k)
+        results = proximity_cache.get(query_embedding_clip)
+        if results is None:
+            async with get_async_db_connection() as conn:
+                results = await crud.search_assets(
+                    conn=conn,
+                    query_embedding_clip=query_embedding_clip,
+                    query_embedding_sbert=query_embedding_sbert,
+                    top_k=top_k,
+                )
+            if not results:
+                logger.debug(f"No results found for query: {query}")
+            proximity_cache.put(query_embedding_clip, results)
+        _search_cache[cache_key] = (time.monotonic(), results)
+        while len(_search_cache) > SEARCH_CACHE_SIZE:
+            _search_cache.popitem(last=False)
+
+    if not validate_scale:
+        return results
+
+    # Cached verdicts cover every uid: filter inline, no job needed.
+    if all(asset["uid"] in _scale_cache for asset in results):
+        return [asset for asset in results if _scale_cache[asset["uid"]]]
+
+    job_id = uuid.uuid4().hex
+    _validation_jobs[job_id] = {"status": "pending", "results": None}
+    while len(_validation_jobs) > VALIDATION_JOBS_SIZE:
+        _validation_jobs.popitem(last=False)
+    task = asyncio.create_task(_run_scale_validation(job_id, results))
+    _validation_tasks.add(task)
+    task.add_done_callback(_validation_tasks.discard)
+    return {"job_id": job_id, "results": results}
+
+
+@router.get("/assets/search/jobs/{job_id}")
+async def get_search_job(job_id: str):
+    """
+    Polls a scale-validation job started by /assets/search.
+    """
+    job = _validation_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+class BatchSearchRequest(BaseModel):
+    queries: list[str]
+    top_k: int = 5
+
+    model_config = ConfigDict(frozen=True)
+
+
+
+
+@router.post("/assets/search/batch", response_model=list[list[Asset]])
+async def search_assets_batch(request: BatchSearchRequest):
+    """
+    Finds the top_k most similar assets for each query in a batch.
+
+    All queries go through one CLIP and one SBERT forward pass and a single
+    SQL statement, so N queries cost roughly one request.
+    """
+    if not request.queries:
+        return []
+
+    query_embeddings_clip, query_embeddings_sbert = await asyncio.gather(
+        asyncio.to_thread(get_clip_embeddings, request.queries),
+        asyncio.to_thread(get_sbert_embeddings, request.queries),
+    )
+    async with get_async_db_connection() as conn:
+        return await crud.search_assets_batch(
             conn=conn,
-            query_embedding_clip=query_embedding_clip,
-            query_embedding_sbert=query_embedding_sbert,
-            top_k=top_k,
+            query_embeddings_clip=query_embeddings_clip,
+            query_embeddings_sbert=query_embeddings_sbert,
+            top_k=request.top_k,
         )
 
-    if not results:
-        logger.debug(f"No results found for query: {query}")
+
+class VectorSearchRequest(BaseModel):
+    query_vectors: list[list[float]]
+    top_k: int = 5
+
+    model_config = ConfigDict(frozen=True)
+
+
+
+
+@router.post("/assets/search/vectors", response_model=list[list[Asset]])
+async def search_assets_by_vectors(request: VectorSearchRequest):
+    """
+    Finds the top_k most similar assets for each client-supplied CLIP
+    embedding, in one round-trip for the whole batch.
+    """
+    if not request.query_vectors:
         return []
-    elif validate_scale:
-        asset_uids = [asset["uid"] for asset in results]
-        asset_paths = download_assets(asset_uids)
-        validation_results = validate_asset_scales(
-            asset_paths, SCALE_MAX_LENGTH_THRESHOLD
+
+    try:
+        # Ragged input passes the list[list[float]] type check but fails here.
+        query_embeddings = np.ascontiguousarray(
+            request.query_vectors, dtype=np.float32
+        )
+    except ValueError:
+        query_embeddings = None
+    if (
+        query_embeddings is None
+        or query_embeddings.ndim != 2
+        or query_embeddings.shape[1] != EMBEDDING_DIMS
+    ):
+        raise HTTPException(
+            status_code=422,
+            detail=f"Each query vector must have {EMBEDDING_DIMS} dimensions",
+        )
+    async with get_async_db_connection() as conn:
+        return await crud.search_assets_by_clip_embeddings(
+            conn=conn, query_embeddings=query_embeddings, top_k=request.top_k
         )
-        return [asset for asset in results if validation_results.get(asset["uid"], False)]
-    return results
 
 
 class AssetThumbnailsRequest(BaseModel):
     asset_uids: list[str]
 
+    model_config = ConfigDict(frozen=True)
+
 
 @router.post("/assets/thumbnails")
-def get_asset_thumbnails(request: AssetThumbnailsRequest):
+async def get_asset_thumbnails(request: AssetThumbnailsRequest):
+    """
+    Generates asset thumbnails for a list of asset UIDs.
+
+    Returns a map of uid -> thumbnail URL; the image bytes are served raw by
+    /assets/{asset_uid}/thumbnail, avoiding the 33% base64 overhead and the
+    per-image encode cost of inlining them into JSON.
+    """
+    asset_paths = await download_assets_coalesced(request.asset_uids)
+    asset_thumbnails = await asyncio.to_thread(get_thumbnails, asset_paths)
+
+    return ORJSONResponse(
+        content={
+            uid: f"/api/v0/assets/{uid}/thumbnail" for uid in asset_thumbnails
+        }
+    )
+
+
+@router.get("/assets/{asset_uid}/thumbnail")
+async def get_asset_thumbnail(asset_uid: str):
     """
-    Gets asset thumbnails for a list of asset UIDs.
+    Serves the thumbnail PNG for a given asset UID, generating it if needed.
     """
-    asset_paths = download_assets(request.asset_uids)
-    asset_thumbnails = get_thumbnails(asset_paths)
+    asset_paths = await download_assets_coalesced([asset_uid])
+    if asset_uid not in asset_paths:
+        raise HTTPException(status_code=404, detail="Asset not found")
 
-    response_data = {}
-    for uid, image_path in asset_thumbnails.items():
-        with open(image_path, "rb") as f:
-            image_data = f.read()
-        response_data[uid] = base64.b64encode(image_data).decode("utf-8")
+    asset_thumbnails = await asyncio.to_thread(
+        get_thumbnails, {asset_uid: asset_paths[asset_uid]}
+    )
+    if asset_uid not in asset_thumbnails:
+        raise HTTPException(status_code=500, detail="Failed to generate thumbnail")
 
-    return JSONResponse(content=response_data)
+    return FileResponse(
+        path=asset_thumbnails[asset_uid],
+        media_type="image/png",
+        filename=f"{asset_uid}.png",
+        headers={"Cache-Control": _IMMUTABLE_CACHE_CONTROL},
+    )
 
 
 @router.get("/assets/download/{asset_uid}/glb")
-def download_glb_file(asset_uid: str):
+async def download_glb_file(asset_uid: str):
     """
     Downloads the .glb file for a given Objaverse asset UID.
     """
     try:
-        asset_paths = download_assets([asset_uid])
+        asset_paths = await download_assets_coalesced([asset_uid])
 
         if asset_uid not in asset_paths:
             raise HTTPException(status_code=404, detail="Asset not found")
 
         glb_path = asset_paths[asset_uid]
 
+        if GLB_ACCEL_REDIRECT_PREFIX:
+            # Hand the transfer to nginx's zero-copy sendfile; the worker is
+            # freed as soon as the headers go out.
+            return Response(
+                headers={
+                    "X-Accel-Redirect": f"{GLB_ACCEL_REDIRECT_PREFIX}{glb_path}",
+                    "Content-Type": "model/gltf-binary",
+                    "Content-Disposition": f'attachment; filename="{asset_uid}.glb"',
+                    "Cache-Control": _IMMUTABLE_CACHE_CONTROL,
+                }
+            )
+
         return FileResponse(
-            path=glb_path, media_type="model/gltf-binary", filename=f"{asset_uid}.glb"
+            path=glb_path,
+            media_type="model/gltf-binary",
+            filename=f"{asset_uid}.glb",
+            headers={"Cache-Control": _IMMUTABLE_CACHE_CONTROL},
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error serving .glb file for asset {asset_uid}: {e}")
         raise HTTPException(status_code=500, detail="Failed to serve .glb file")
 
 
+def _compute_dimensions(asset_uid: str, glb_path: str) -> dict:
+    success, dimensions, error = get_glb_dimensions(glb_path)
+
+    if not success:
+        logger.error(f"Error getting dimensions for asset {asset_uid}: {error}")
+        raise HTTPException(status_code=500, detail="Failed to get asset dimensions")
+
+    x_size, y_size, z_size = dimensions
+    return {"x": x_size, "y": y_size, "z": z_size}
+
+
 @router.get("/assets/{asset_uid}/metadata")
-def get_asset_metadata(asset_uid: str):
+async def get_asset_metadata(asset_uid: str):
     """
     Gets metadata for a given asset UID, including dimensions.
+
+    Dimensions are cached in the database; the GLB is only downloaded and
+    parsed the first time an asset's metadata is requested.
     """
     try:
-        asset_paths = download_assets([asset_uid])
-
-        if asset_uid not in asset_paths:
-            raise HTTPException(status_code=404, detail="Asset not found")
-
-        glb_path = asset_paths[asset_uid]
-        success, dimensions, error = get_glb_dimensions(glb_path)
-
-        if not success:
-            logger.error(f"Error getting dimensions for asset {asset_uid}: {error}")
-            raise HTTPException(status_code=500, detail="Failed to get asset dimensions")
-
-        x_size, y_size, z_size = dimensions
-        metadata = {
-            "uid": asset_uid,
-            "dimensions": {
-                "x": x_size,
-                "y": y_size,
-                "z": z_size
-            }
-        }
+        async with get_async_db_connection() as conn:
+            row = await crud.get_asset_dimensions(conn, asset_uid)
+        if row is not None and row["dimensions"] is not None:
+            dimensions = row["dimensions"]
+        else:
+            asset_paths = await download_assets_coalesced([asset_uid])
+            if asset_uid not in asset_paths:
+                raise HTTPException(status_code=404, detail="Asset not found")
+            dimensions = await asyncio.to_thread(
+                _compute_dimensions, asset_uid, asset_paths[asset_uid]
+            )
+            # Write back so future requests are a single row fetch.
+            async with get_async_db_connection() as conn:
+                await crud.set_asset_dimensions(conn, asset_uid, dimensions)
 
-        return JSONResponse(content=metadata)
+        return ORJSONResponse(content={"uid": asset_uid, "dimensions": dimensions})
 
     except HTTPException:
         raise
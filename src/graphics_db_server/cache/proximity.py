@@ -0,0 +1,71 @@
+"""
+Proximity cache: serves results for queries whose embeddings land close to
+a recently answered one, skipping the database round-trip entirely.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+
+class ProximityCache:
+    """
+    Fixed-capacity LRU of (query embedding, results) pairs.
+
+    Lookups compare the incoming embedding against all cached ones with a
+    single matrix-vector product; embeddings are unit-length, so the dot
+    product is cosine similarity. A hit within the threshold returns the
+    cached results. Capacity is small (default 256), so the scan is a few
+    hundred kilobytes of contiguous reads — far cheaper than a DB call.
+
+    With ttl set, entries expire after that many seconds so a near-match
+    hit can't serve results older than the caller's freshness window.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 256,
+        similarity_threshold: float = 0.99,
+        ttl: Optional[float] = None,
+    ):
+        self.capacity = capacity
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self._entries: OrderedDict[int, tuple[np.ndarray, object, float]] = (
+            OrderedDict()
+        )
+        self._next_key = 0
+
+    def get(self, query_embedding: np.ndarray):
+        """
+        Returns the cached results nearest to query_embedding, or None if
+        nothing fresh is within the similarity threshold.
+        """
+        if self.ttl is not None and self._entries:
+            cutoff = time.monotonic() - self.ttl
+            expired = [key for key, entry in self._entries.items() if entry[2] < cutoff]
+            for key in expired:
+                del self._entries[key]
+        if not self._entries:
+            return None
+        keys = list(self._entries)
+        cache_mat = np.stack([self._entries[key][0] for key in keys])
+        similarities = cache_mat @ query_embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+        best_key = keys[best]
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key][1]
+
+    def put(self, query_embedding: np.ndarray, results) -> None:
+        self._entries[self._next_key] = (
+            np.asarray(query_embedding, dtype=np.float32),
+            results,
+            time.monotonic(),
+        )
+        self._next_key += 1
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
@@ -1,13 +1,94 @@
 # app/db/session.py
 
-from contextlib import contextmanager
-from psycopg_pool import ConnectionPool
-from pgvector.psycopg import register_vector
+from contextlib import asynccontextmanager, contextmanager
 
-from graphics_db_server.core.config import db_settings
+import psycopg
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+from pgvector.psycopg import register_vector, register_vector_async
 
-# reusable connection pool
-pool = ConnectionPool(conninfo=str(db_settings.DATABASE_URL))
+from graphics_db_server.core.config import (
+    get_db_settings,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_MAX_SIZE,
+    INDEX_NAME,
+    WARM_INDEXES,
+)
+from graphics_db_server.logging import logger
+
+async def _configure_async(conn):
+    # Prepare server-side from the first execution: the search statements are
+    # fixed-shape and hot, so skipping re-parse/re-plan on every call pays off
+    # on pooled connections that live for many requests.
+    conn.prepare_threshold = 0
+    # Registering here runs the pgvector type lookup once per physical
+    # connection instead of once per checkout.
+    await register_vector_async(conn)
+
+
+def _configure(conn):
+    conn.prepare_threshold = 0
+    register_vector(conn)
+
+
+# Async pool for the API; opened and pre-warmed via open_pool() at startup.
+async_pool = AsyncConnectionPool(
+    conninfo=str(get_db_settings().DATABASE_URL),
+    min_size=DB_POOL_MIN_SIZE,
+    max_size=DB_POOL_MAX_SIZE,
+    open=False,
+    configure=_configure_async,
+)
+
+# Sync pool for scripts (ingest, etc.) that run outside the event loop.
+pool = ConnectionPool(
+    conninfo=str(get_db_settings().DATABASE_URL),
+    min_size=1,
+    max_size=DB_POOL_MAX_SIZE,
+    open=False,
+    configure=_configure,
+)
+
+
+async def _prewarm_indexes():
+    """
+    Pulls the vector indexes into Postgres shared_buffers so post-deploy
+    searches hit RAM instead of cold disk.
+    """
+    try:
+        async with async_pool.connection() as conn:
+            await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_prewarm;")
+            for index in (f"{INDEX_NAME}_clip", f"{INDEX_NAME}_sbert"):
+                await conn.execute(
+                    "SELECT pg_prewarm(%s::regclass, 'buffer');", (index,)
+                )
+    except psycopg.Error as e:
+        # Non-fatal: the cache warms itself on the first queries instead.
+        logger.warning(f"Index prewarm skipped: {e}")
+
+
+async def open_pool():
+    """
+    Opens the async pool and blocks until min_size connections are
+    established, so the first requests don't pay the TCP/auth handshake.
+    """
+    await async_pool.open(wait=True)
+    if WARM_INDEXES:
+        await _prewarm_indexes()
+
+
+async def close_pool():
+    await async_pool.close()
+
+
+@asynccontextmanager
+async def get_async_db_connection():
+    """
+    An async context manager yielding a pooled connection with pgvector
+    adaptation registered.
+    """
+    # pgvector adaptation is registered by the pool's configure callback.
+    async with async_pool.connection() as conn:
+        yield conn
 
 
 @contextmanager
@@ -15,10 +96,11 @@ def get_db_connection():
     """
     A context manager to get a connection from the pool and ensure it's returned.
     """
+    # Scripts use this without going through the app lifespan.
+    if pool.closed:
+        pool.open()
     conn = pool.getconn()
     try:
-        # This is required for every connection!
-        register_vector(conn)
         yield conn
     finally:
         pool.putconn(conn)
@@ -0,0 +1,85 @@
+"""
+Micro-batching for embedding requests.
+
+Transformer inference cost is dominated by weight loads, so encoding a batch
+of queries costs barely more than encoding one. This module coalesces queries
+that arrive within a short window into a single forward pass.
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+
+
+class AsyncBatcher:
+    """
+    Coalesces concurrent single-query embedding requests into batched calls.
+
+    Embeddings are also memoized in an LRU cache, since popular queries repeat
+    heavily and a cache hit skips the forward pass entirely.
+
+    Args:
+        encode_fn: A function that maps a list of query strings to a 2-D
+            embedding matrix (one row per query).
+        max_batch_size: Maximum number of queries per forward pass.
+        max_queue_time: Seconds to wait for more queries before flushing.
+        cache_size: Maximum number of query embeddings to memoize.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[list[str]], np.ndarray],
+        max_batch_size: int = 32,
+        max_queue_time: float = 0.005,
+        cache_size: int = 4096,
+    ):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_queue_time = max_queue_time
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._queue: list[tuple[str, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+
+    async def process(self, query: str) -> np.ndarray:
+        """
+        Submits a query and waits for its embedding from the next batch.
+        """
+        if query in self._cache:
+            self._cache.move_to_end(query)
+            return self._cache[query]
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((query, future))
+        if len(self._queue) >= self.max_batch_size:
+            await self._flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+        return await future
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.max_queue_time)
+        await self._flush()
+
+    async def _flush(self):
+        if not self._queue:
+            return
+        batch, self._queue = self._queue[: self.max_batch_size], self._queue[
+            self.max_batch_size :
+        ]
+        queries = [query for query, _ in batch]
+        try:
+            embeddings = await asyncio.to_thread(self.encode_fn, queries)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (query, future), embedding in zip(batch, embeddings):
+            self._cache[query] = embedding
+            if not future.done():
+                future.set_result(embedding)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
@@ -19,16 +19,39 @@ device = "cuda" if torch.cuda.is_available() else "cpu"
 )
 clip_tokenizer = open_clip.get_tokenizer("ViT-L-14")
 
-
-def get_clip_embeddings(text_query: str):
-    with torch.no_grad():
+clip_model.eval()
+if device == "cuda":
+    # BF16 matmuls hit tensor cores (~2x over FP32); torch.compile fuses the
+    # text-encoder kernels. Outputs are cast back to FP32 before normalizing.
+    clip_model = clip_model.to(dtype=torch.bfloat16)
+    clip_model.encode_text = torch.compile(
+        clip_model.encode_text, mode="reduce-overhead"
+    )
+
+
+def get_clip_embeddings(text_query: str | list[str]):
+    """
+    Generates CLIP text embeddings for a single query or a batch of queries.
+
+    Returns a 1-D vector for a single string and a 2-D matrix for a list.
+    """
+    queries = [text_query] if isinstance(text_query, str) else text_query
+    with torch.inference_mode():
+        tokens = clip_tokenizer(queries)
+        if device == "cuda":
+            # Pinned staging lets the host-to-device copy run async instead
+            # of stalling the stream on pageable memory.
+            tokens = tokens.pin_memory()
         query_feature_clip = clip_model.encode_text(
-            clip_tokenizer([text_query]).to(device)
+            tokens.to(device, non_blocking=True)
         )
-        query_feature_clip = F.normalize(query_feature_clip, p=2, dim=-1)
+        # Normalize in FP32 for numerical stability under BF16 inference.
+        query_feature_clip = F.normalize(query_feature_clip.float(), p=2, dim=-1)
+
+        embeddings = query_feature_clip.cpu().numpy()
 
-        # Squeeze the batch dimension for a single query and move to CPU
-        return query_feature_clip.squeeze(0).cpu().numpy()
+    # Squeeze the batch dimension for a single query
+    return embeddings[0] if isinstance(text_query, str) else embeddings
 
 
 if __name__ == "__main__":
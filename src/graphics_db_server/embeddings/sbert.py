@@ -7,10 +7,17 @@ device = "cuda" if torch.cuda.is_available() else "cpu"
 sbert_model = SentenceTransformer("all-mpnet-base-v2", device=device)
 
 
-def get_sbert_embeddings(text_query: str):
+def get_sbert_embeddings(text_query: str | list[str]):
     """
-    Generates SBERT embeddings for a given text query.
+    Generates SBERT embeddings for a single query or a batch of queries.
+
+    Returns a 1-D vector for a single string and a 2-D matrix for a list.
     """
+    # Unit-length output: search uses the inner-product operator, which only
+    # equals cosine similarity for normalized vectors.
     return sbert_model.encode(
-        text_query, convert_to_tensor=False, show_progress_bar=False
+        text_query,
+        convert_to_tensor=False,
+        show_progress_bar=False,
+        normalize_embeddings=True,
     )
@@ -1,15 +1,38 @@
+from contextlib import asynccontextmanager
+
 import psycopg
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
+from graphics_db_server.api.middleware import AdmissionControlMiddleware
 from graphics_db_server.api.v0.endpoints import assets
-from graphics_db_server.core.config import TABLE_NAME
-from graphics_db_server.db.session import get_db_connection
+from graphics_db_server.core.config import (
+    MAX_CONCURRENT_SEARCHES,
+    SEARCH_QUEUE_TIMEOUT,
+    TABLE_NAME,
+)
+from graphics_db_server.db.session import close_pool, get_async_db_connection, open_pool
 from graphics_db_server.logging import configure_logging, logger
 
 configure_logging(level="DEBUG")
 
-app = FastAPI(title="Graphics DB API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pre-warm the connection pool so early requests skip connection setup.
+    await open_pool()
+    yield
+    await close_pool()
+
+
+# orjson serializes large result payloads (embedding-sized float lists,
+# batched search results) several times faster than the stdlib encoder.
+app = FastAPI(
+    title="Graphics DB API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,21 +42,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Cap concurrent CLIP/SBERT inference so bursts queue instead of piling up.
+# Job polling lives under the search prefix but runs no encoder; it must not
+# compete for inference slots, especially when the server is saturated.
+app.add_middleware(
+    AdmissionControlMiddleware,
+    paths=["/api/v0/assets/search"],
+    exclude_paths=["/api/v0/assets/search/jobs"],
+    max_concurrent=MAX_CONCURRENT_SEARCHES,
+    queue_timeout=SEARCH_QUEUE_TIMEOUT,
+)
+
 app.include_router(assets.router, prefix="/api/v0", tags=["Assets"])
 
 
 @app.get("/healthcheck")
-def healthcheck():
+async def healthcheck():
     """
     Check database connection and if data is loaded.
     """
     try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT 1")
+        async with get_async_db_connection() as conn:
+            async with conn.cursor() as cur:
+                # Pipeline both probes into a single network round-trip.
+                async with conn.pipeline():
+                    await cur.execute("SELECT 1")
 
-                cur.execute(f"SELECT EXISTS (SELECT 1 FROM {TABLE_NAME});")
-                data_exists = cur.fetchone()[0]
+                    await cur.execute(f"SELECT EXISTS (SELECT 1 FROM {TABLE_NAME});")
+                # Fetch after the pipeline syncs but before the cursor closes.
+                data_exists = (await cur.fetchone())[0]
 
         return {"status": "ok", "db": "ok", "data_exists": data_exists}
     except psycopg.Error as e:
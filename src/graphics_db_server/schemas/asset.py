@@ -2,7 +2,7 @@ import uuid
 from typing import Optional
 
 import numpy as np
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 
 
 class Asset(BaseModel):
@@ -13,15 +13,28 @@ class Asset(BaseModel):
     license: str | None = None # TEMP
     # sourceId: str  # NOTE: let's try not to keep this unless really necessary
 
-    model_config = ConfigDict(from_attributes=True)
+    # Assets are value objects; nothing mutates them after construction.
+    # (frozen doesn't make them hashable — tags is a list.)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class AssetCreate(Asset):
-    clip_embedding: list[float] | np.ndarray
-    sbert_embedding: list[float] | np.ndarray
+    clip_embedding: np.ndarray
+    sbert_embedding: np.ndarray
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+    @field_validator("clip_embedding", "sbert_embedding", mode="before")
+    @classmethod
+    def _as_float32_array(cls, v):
+        # Single-branch ndarray field: no union discrimination, and the
+        # pgvector binary dumper gets a contiguous float32 buffer as-is.
+        # A no-op (zero-copy) when the input already matches; marked
+        # read-only since the buffer may be shared with the source array.
+        v = np.ascontiguousarray(v, dtype=np.float32)
+        v.setflags(write=False)
+        return v
+
 
 # class SearchResult(BaseModel):
 #     raise NotImplementedError
@@ -4,10 +4,14 @@ from pgvector.psycopg import register_vector
 from psycopg_pool import ConnectionPool
 
 from graphics_db_server.core.config import (
-    db_settings,
+    get_db_settings,
+    EMBEDDING_COL_TYPE,
     EMBEDDING_DIMS,
+    HNSW_EF_CONSTRUCTION,
+    HNSW_M,
     INDEX_NAME,
     INDEX_TYPE,
+    IVFFLAT_LISTS,
     SIMILARITY_OPS,
     TABLE_NAME,
 )
@@ -27,28 +31,39 @@ CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
     
     url TEXT,
     tags TEXT[],
-    clip_embedding VECTOR({EMBEDDING_DIMS}),
-    sbert_embedding VECTOR({EMBEDDING_DIMS})
+    source TEXT,
+    license TEXT,
+    -- x/y/z extents, populated lazily on first metadata request
+    dimensions JSONB,
+    clip_embedding {EMBEDDING_COL_TYPE.upper()}({EMBEDDING_DIMS}),
+    sbert_embedding {EMBEDDING_COL_TYPE.upper()}({EMBEDDING_DIMS})
 )
 """
 
+if INDEX_TYPE == "ivfflat":
+    INDEX_OPTIONS = f" WITH (lists = {IVFFLAT_LISTS})"
+elif INDEX_TYPE == "hnsw":
+    INDEX_OPTIONS = f" WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION})"
+else:
+    INDEX_OPTIONS = ""
+
 VEC_INDEX_CREATION_SQL_CLIP = f"""
 CREATE INDEX IF NOT EXISTS {INDEX_NAME}_clip
 ON {TABLE_NAME}
-USING {INDEX_TYPE} (clip_embedding {SIMILARITY_OPS})
+USING {INDEX_TYPE} (clip_embedding {SIMILARITY_OPS}){INDEX_OPTIONS}
 """
 
 VEC_INDEX_CREATION_SQL_SBERT = f"""
 CREATE INDEX IF NOT EXISTS {INDEX_NAME}_sbert
 ON {TABLE_NAME}
-USING {INDEX_TYPE} (sbert_embedding {SIMILARITY_OPS});
+USING {INDEX_TYPE} (sbert_embedding {SIMILARITY_OPS}){INDEX_OPTIONS};
 """
 
 
 def setup_databse(force: bool = False):
     """Connects to DB and runs setup commands."""
 
-    pool = ConnectionPool(conninfo=db_settings.DATABASE_URL)
+    pool = ConnectionPool(conninfo=get_db_settings().DATABASE_URL)
     with pool.getconn() as conn:
         with conn.cursor() as cur:
             logger.info("Enabling extensions...")
@@ -1,15 +1,16 @@
+import asyncio
+import json
 import os
 import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import compress_pickle
 import numpy as np
 import objaverse
 
 # import objaverse.xl as oxl
-from pydantic import BaseModel
-
 from graphics_db_server.core.config import (
     EMBEDDING_PATHS,
     USE_MEAN_POOL,
@@ -26,8 +27,15 @@ def _is_valid_annotation(annotation: dict[str, Any]) -> bool:
     """
     Checks if an objaverse annotation has all the required fields and non-None values.
     """
-    required_fields = ["uid", "viewerUrl", "tags", "license"]
-    return not any(annotation.get(field) is None for field in required_fields)
+    # Bound method + short-circuit and: no generator frame per call on a
+    # function invoked once per candidate annotation.
+    get = annotation.get
+    return (
+        get("uid") is not None
+        and get("viewerUrl") is not None
+        and get("tags") is not None
+        and get("license") is not None
+    )
 
 
 def _get_tag_names(tags: list[dict[str, Any]]) -> list[str]:
@@ -36,19 +44,23 @@ def _get_tag_names(tags: list[dict[str, Any]]) -> list[str]:
     """
     if not isinstance(tags, list):
         return []
-    return [
-        tag["name"]
-        for tag in tags
-        if isinstance(tag, dict) and isinstance(tag.get("name"), str)
-    ]
+    try:
+        # Fast path: well-formed {"name": str} dicts, no per-element checks.
+        return [tag["name"] for tag in tags]
+    except (TypeError, KeyError):
+        return [
+            tag["name"]
+            for tag in tags
+            if isinstance(tag, dict) and isinstance(tag.get("name"), str)
+        ]
 
 
 def _load_embedding_map(
     embedding_type: str,
     data_source: str = "Objaverse",
-) -> dict[str, np.ndarray]:
+) -> tuple[dict[str, int], np.ndarray]:
     """
-    Loads embeddings from a pickled file and returns a map from UID to embedding.
+    Loads embeddings from a pickled file, structure-of-arrays style.
 
     The pickled file is expected to be a dictionary with keys for UIDs and features.
 
@@ -57,29 +69,73 @@ def _load_embedding_map(
         data_source: The name of the data source from the config.
 
     Returns:
-        A dictionary mapping object UIDs to their corresponding embedding vectors.
+        A (uid_to_row, features) pair: a dict mapping object UIDs to row
+        indices into the single (N, D) feature matrix. Keeping one matrix
+        plus int indices avoids materializing millions of per-UID ndarray
+        view objects up front.
     """
     path = EMBEDDING_PATHS[data_source][embedding_type]
     if not os.path.exists(path):
         raise FileNotFoundError(f"Embeddings file not found at {path}")
 
+    uids_with_embeddings, embeddings = _load_embedding_arrays(path, embedding_type)
+
+    uid_to_row = {uid: row for row, uid in enumerate(uids_with_embeddings)}
+    return uid_to_row, embeddings
+
+
+def _load_embedding_arrays(path: str, embedding_type: str) -> tuple[list, np.ndarray]:
+    """
+    Loads (uids, features) for an embeddings pickle, via cached sidecars.
+
+    The compressed pickle takes minutes to decode on every cold start, so the
+    first load writes an uncompressed .npy + uid-list sidecar next to it;
+    later loads memory-map the .npy, making startup page-cache-speed and
+    keeping the feature matrix out of resident memory until rows are touched.
+    """
+    features_path = f"{path}.features.npy"
+    uids_path = f"{path}.uids.json"
+    if os.path.exists(features_path) and os.path.exists(uids_path):
+        with open(uids_path) as f:
+            uids = json.load(f)
+        return uids, np.load(features_path, mmap_mode="r")
+
     embeddings_dict = compress_pickle.load(path)
-    uids_with_embeddings = embeddings_dict["uids"]
+    uids = list(embeddings_dict["uids"])
 
     feature_key = "img_features" if embedding_type == "clip" else "text_features"
     embeddings = embeddings_dict[feature_key].astype(np.float32)
 
-    embedding_map = {
-        uid: embedding for uid, embedding in zip(uids_with_embeddings, embeddings)
-    }
-    return embedding_map
+    if embeddings.ndim == 3:
+        # Multi-view features (N, V, D): pool once here as a single
+        # vectorized reduction instead of one tiny mean() per asset in the
+        # ingest loop.
+        # NOTE: The reference implementation handles this differently at
+        #       query time, by taking the maximum similarity across all
+        #       embeddings for a single item. This is often a more
+        #       effective approach.
+        if not USE_MEAN_POOL:
+            raise NotImplementedError()
+        embeddings = embeddings.mean(axis=1)
+
+    # Store the sidecar as float16: these are unit-length directional
+    # vectors headed for halfvec columns anyway, so the extra float32
+    # precision is noise — and the mmap'd file moves half the bytes per
+    # row gather. Ingest upcasts to float32 only for normalization.
+    embeddings = embeddings.astype(np.float16)
+
+    np.save(features_path, embeddings)
+    with open(uids_path, "w") as f:
+        json.dump(uids, f)
+    logger.info(f"Wrote embedding sidecar cache for {path}")
+    return uids, embeddings
 
 
 def load_objaverse_assets(
     limit: int = None,
     validate_scale: bool = False,
     max_edge_length: float = SCALE_MAX_LENGTH_THRESHOLD,
-    scale_resolution_strategy: str = "reject",
+    scale_resolution_strategy: Literal["reject", "rescale"] = "reject",
 ) -> list[AssetCreate]:
     """
     Loads asset metadata from the objaverse dataset.
@@ -94,32 +150,33 @@ def load_objaverse_assets(
     """
     # NOTE: this will download a ~3GB file on first run.
     annotations = objaverse.load_annotations()
-    clip_embedding_map = _load_embedding_map("clip")
-    sbert_embedding_map = _load_embedding_map("sbert")
+    clip_uid_to_row, clip_features = _load_embedding_map("clip")
+    sbert_uid_to_row, sbert_features = _load_embedding_map("sbert")
 
     # First, collect candidate assets based on metadata
     candidate_assets = []
     candidate_uids = []
 
-    for uid, annotation in annotations.items():
-        if not _is_valid_annotation(annotation):
-            continue
+    # Most annotations have no embeddings, so iterate the (much smaller)
+    # set of UIDs present in both embedding maps instead of all annotations.
+    # Ordered by the CLIP uid list to keep selection deterministic.
+    embedded_uids = [uid for uid in clip_uid_to_row if uid in sbert_uid_to_row]
 
-        clip_embedding = clip_embedding_map.get(uid)
-        sbert_embedding = sbert_embedding_map.get(uid)
-        if clip_embedding is None or sbert_embedding is None:
+    for uid in embedded_uids:
+        annotation = annotations.get(uid)
+        if annotation is None or not _is_valid_annotation(annotation):
             continue
 
-        if clip_embedding.ndim != 1:
-            if USE_MEAN_POOL:
-                # NOTE: The reference implementation handles this differently at query
-                #       time, by taking the maximum similarity across all embeddings
-                #       for a single item. This is often a more effective approach.
-                clip_embedding = clip_embedding.mean(0)
-            else:
-                raise NotImplementedError()
+        # Multi-view features are mean-pooled at load time, so rows here
+        # are always 1-D.
+        clip_embedding = clip_features[clip_uid_to_row[uid]]
+        sbert_embedding = sbert_features[sbert_uid_to_row[uid]]
 
-        asset = AssetCreate(
+        # Trusted internal path: the fields were just produced by this loader
+        # (embedding rows are float16 from _load_embedding_map; insert_assets
+        # upcasts to float32 when stacking for COPY), so skip pydantic-core
+        # validation. API ingress keeps the full constructor.
+        asset = AssetCreate.model_construct(
             uid=uid,
             url=annotation.get("viewerUrl"),  # NOTE: there's also uri
             tags=_get_tag_names(annotation.get("tags")),
@@ -144,50 +201,105 @@ def load_objaverse_assets(
     if not candidate_uids:
         return []
 
-    logger.info(f"Found {len(candidate_uids)} candidate assets. Downloading GLB files for validation...")
-
-    # Download the GLB files for validation
-    asset_paths = download_assets(candidate_uids)
-
-    logger.info(f"Downloaded {len(asset_paths)} GLB files. Validating scales...")
+    logger.info(
+        f"Found {len(candidate_uids)} candidate assets. Validating scales as downloads complete..."
+    )
 
-    # Validate the scales
-    validation_results = validate_asset_scales(asset_paths, max_edge_length)
+    # Stream downloads into validation instead of downloading the whole
+    # candidate pool up front: each worker fetches one GLB and validates it,
+    # and once `limit` assets have passed, pending downloads are cancelled.
+    assets_by_uid = {asset.uid: asset for asset in candidate_assets}
+
+    def _download_and_validate(uid: str) -> tuple[str, bool]:
+        asset_paths = download_assets([uid], download_processes=1)
+        if uid not in asset_paths:
+            logger.warning(f"Download failed for asset {uid}")
+            return uid, False
+        results = validate_asset_scales(
+            {uid: asset_paths[uid]}, max_edge_length
+        )
+        return uid, results.get(uid, False)
 
-    # Filter to only include valid assets
     valid_assets = []
-    for asset in candidate_assets:
-        if validation_results.get(asset.uid, False):
-            valid_assets.append(asset)
-        else:
-            if scale_resolution_strategy == "reject":
-                continue
+    max_workers = min(32, (multiprocessing.cpu_count() or 1) * 4, len(candidate_uids))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_download_and_validate, uid) for uid in candidate_uids
+        ]
+        for future in as_completed(futures):
+            uid, is_valid = future.result()
+            if is_valid:
+                valid_assets.append(assets_by_uid[uid])
             elif scale_resolution_strategy == "rescale":
                 raise NotImplementedError()
-        if limit is not None and len(valid_assets) >= limit:
-            break
-
-
+            if limit is not None and len(valid_assets) >= limit:
+                executor.shutdown(wait=False, cancel_futures=True)
+                break
 
-    logger.info(f"Scale validation complete. {len(valid_assets)} out of {len(candidate_assets)} assets passed validation.")
+    logger.info(
+        f"Scale validation complete. {len(valid_assets)} out of {len(candidate_assets)} assets passed validation."
+    )
 
     return valid_assets
 
 
-def download_assets(asset_ids: list[str]):
+def download_assets(asset_ids: list[str], download_processes: int | None = None):
     """
     Downloads 3D assets from Objaverse based on a list of asset UIDs.
 
     Args:
         asset_ids (list[str]): A list of asset UIDs to download.
+        download_processes: Number of download workers; defaults to an
+            oversubscribed count, since downloads wait on the network, not
+            the CPU.
     """
-    processes = multiprocessing.cpu_count()
+    if download_processes is None:
+        download_processes = min(32, multiprocessing.cpu_count() * 4, len(asset_ids))
     asset_paths = objaverse.load_objects(
-        uids=asset_ids, download_processes=int(processes / 2)
+        uids=asset_ids, download_processes=max(download_processes, 1)
     )
     return asset_paths
 
 
+# Single-flight coalescing: concurrent requests for the same UID share one
+# in-flight download instead of hammering the Objaverse CDN N times.
+_inflight_downloads: dict[str, asyncio.Task] = {}
+
+
+async def _download_group(asset_ids: list[str]) -> dict[str, str]:
+    try:
+        return await asyncio.to_thread(download_assets, asset_ids)
+    finally:
+        for uid in asset_ids:
+            _inflight_downloads.pop(uid, None)
+
+
+async def download_assets_coalesced(asset_ids: list[str]) -> dict[str, str]:
+    """
+    Downloads assets, deduplicating concurrent requests for the same UIDs.
+
+    UIDs already being fetched by another request are awaited rather than
+    re-downloaded; only the remainder starts a new download.
+    """
+    unique_uids = list(dict.fromkeys(asset_ids))
+    new_uids = [uid for uid in unique_uids if uid not in _inflight_downloads]
+    if new_uids:
+        task = asyncio.create_task(_download_group(new_uids))
+        for uid in new_uids:
+            _inflight_downloads[uid] = task
+
+    tasks = []
+    for uid in unique_uids:
+        task = _inflight_downloads.get(uid)
+        if task is not None and task not in tasks:
+            tasks.append(task)
+
+    asset_paths: dict[str, str] = {}
+    for task in tasks:
+        asset_paths.update(await task)
+    return {uid: asset_paths[uid] for uid in unique_uids if uid in asset_paths}
+
+
 
 
 def get_thumbnails(asset_paths: dict[str, str]) -> dict[str, Path]:
@@ -200,19 +312,54 @@ def get_thumbnails(asset_paths: dict[str, str]) -> dict[str, Path]:
     Returns:
         A dictionary mapping asset UIDs to the file paths of their generated thumbnails.
     """
+    if not asset_paths:
+        return {}
+
     asset_thumbnails = {}
+
+    # One scandir per parent directory replaces a stat() per asset and lets
+    # already-rendered thumbnails be reused instead of regenerated.
+    existing_pngs: dict[Path, set[str]] = {}
+    pending: dict[str, tuple[Path, Path]] = {}
     for uid, glb_path_str in asset_paths.items():
         glb_path = Path(glb_path_str).resolve()
         output_path = glb_path.with_suffix(".png")
-
-        generate_thumbnail_from_glb(
-            glb_path=str(glb_path),
-            output_path=str(output_path),
-            resolution=THUMBNAIL_RESOLUTION,
-        )
-
-        if output_path.exists():
+        parent = glb_path.parent
+        if parent not in existing_pngs:
+            existing_pngs[parent] = {
+                entry.name for entry in os.scandir(parent) if entry.name.endswith(".png")
+            }
+        if output_path.name in existing_pngs[parent]:
             asset_thumbnails[uid] = output_path
+        else:
+            pending[uid] = (glb_path, output_path)
+
+    if not pending:
+        return asset_thumbnails
+
+    # Rasterization is CPU-bound and independent per file, so fan out over
+    # processes (threads would serialize on the GIL and renderer state).
+    max_workers = min(os.cpu_count() or 1, len(pending))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for uid, (glb_path, output_path) in pending.items():
+            future = executor.submit(
+                generate_thumbnail_from_glb,
+                glb_path=str(glb_path),
+                output_path=str(output_path),
+                resolution=THUMBNAIL_RESOLUTION,
+            )
+            futures[future] = (uid, output_path)
+
+        for future in as_completed(futures):
+            uid, output_path = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Thumbnail generation failed for {uid}: {e}")
+                continue
+            if output_path.exists():
+                asset_thumbnails[uid] = output_path
 
     return asset_thumbnails
 
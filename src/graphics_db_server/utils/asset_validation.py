@@ -1,10 +1,23 @@
+import os
 import sys
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
 from typing import Optional
 
 from graphics_db_server.logging import logger
 from graphics_db_server.utils.geometry import get_max_dimension
 
+# Shared across validate_asset_scales calls so repeated batches don't pay
+# worker spawn cost each time; created lazily to keep import side-effect free.
+_validation_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_validation_pool() -> ProcessPoolExecutor:
+    global _validation_pool
+    if _validation_pool is None:
+        _validation_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _validation_pool
+
 
 def check_asset_scale(
     glb_path: str, max_edge_length: float = 100.0
@@ -21,7 +34,9 @@ def check_asset_scale(
         tuple: (is_valid, reason) where is_valid is True if the asset passes validation,
                and reason is a string explaining why validation failed (if applicable)
     """
-    success, max_edge, error = get_max_dimension(glb_path)
+    # Pass the threshold down so bounds traversal can stop the moment the
+    # running box is already over it.
+    success, max_edge, error = get_max_dimension(glb_path, early_exit_edge=max_edge_length)
 
     if not success:
         return False, f"Error validating asset: {error}"
@@ -50,20 +65,49 @@ def validate_asset_scales(
         A dictionary mapping asset UIDs to validation results (True if valid, False if rejected).
     """
     validation_results = {}
+    to_check = {}
     for uid, glb_path_str in asset_paths.items():
-        glb_path = Path(glb_path_str).resolve()
-
-        if not glb_path.exists():
+        # isfile is a single stat; resolve() walked every path component.
+        if not os.path.isfile(glb_path_str):
             validation_results[uid] = False
-            logger.warning(f"GLB file not found for asset {uid}: {glb_path}")
+            logger.warning(f"GLB file not found for asset {uid}: {glb_path_str}")
             continue
 
-        is_valid, reason = check_asset_scale(str(glb_path), max_edge_length)
+        to_check[uid] = glb_path_str
+
+    if not to_check:
+        return validation_results
+
+    check = partial(check_asset_scale, max_edge_length=max_edge_length)
+    if len(to_check) == 1:
+        # Not worth dispatching to the pool for a single file.
+        uid, path = next(iter(to_check.items()))
+        result_items = [(uid, check(path))]
+    else:
+        # Mesh parsing is CPU-bound and independent per file; processes
+        # sidestep the GIL for near-linear scaling across cores. Consuming
+        # futures as they complete keeps one pathological GLB from holding
+        # up reporting on the rest.
+        executor = _get_validation_pool()
+        futures = {executor.submit(check, path): uid for uid, path in to_check.items()}
+        result_items = [
+            (futures[future], future.result()) for future in as_completed(futures)
+        ]
+
+    rejected = 0
+    for uid, (is_valid, reason) in result_items:
         validation_results[uid] = is_valid
 
         if not is_valid:
-            logger.info(f"Rejecting asset {uid}: {reason}")
+            rejected += 1
+            logger.debug(f"Rejecting asset {uid}: {reason}")
         else:
-            logger.info(f"Asset {uid} passed scale validation")
-
+            logger.debug(f"Asset {uid} passed scale validation")
+
+    # One line per batch instead of one per asset; the per-asset verdicts
+    # stay available at debug level.
+    logger.info(
+        f"Scale validation: {len(result_items) - rejected}/{len(result_items)} "
+        f"assets passed ({rejected} rejected)"
+    )
     return validation_results
@@ -1,19 +1,211 @@
+import json
+import os
+import struct
 from typing import Optional
 
+import numpy as np
 import pyvista as pv
 
 
-def get_glb_bounding_box(glb_path: str) -> tuple[bool, Optional[tuple], Optional[str]]:
+def _node_matrix(node: dict) -> np.ndarray:
     """
-    Extract bounding box from a GLB file using PyVista.
+    Builds a node's local 4x4 transform from its matrix or TRS properties.
+    """
+    if "matrix" in node:
+        return np.array(node["matrix"], dtype=np.float64).reshape(4, 4).T
+
+    matrix = np.eye(4)
+    if "rotation" in node:
+        x, y, z, w = node["rotation"]
+        matrix[:3, :3] = np.array(
+            [
+                [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+                [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+                [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+            ]
+        )
+    if "scale" in node:
+        matrix[:3, :3] = matrix[:3, :3] * np.array(node["scale"], dtype=np.float64)
+    if "translation" in node:
+        matrix[:3, 3] = node["translation"]
+    return matrix
+
+
+class _BoundsExceeded(Exception):
+    """
+    Raised to abandon a bounds traversal once the running box is already
+    larger than the caller's limit; carries the (truncated) bounds so far.
+    """
+
+    def __init__(self, bounds: tuple):
+        super().__init__("Bounds exceed early-exit edge")
+        self.bounds = bounds
+
+
+def _fast_glb_bounds(glb_path: str, early_exit_edge: Optional[float] = None) -> tuple:
+    """
+    Computes scene bounds from the glTF JSON chunk alone.
+
+    POSITION accessors are required by the spec to carry min/max, so the
+    bounding box falls out of transforming each primitive's accessor box
+    through its node's world matrix — no mesh data is read and no renderer
+    is constructed. Raises ValueError when the file can't be handled.
+
+    With early_exit_edge set, traversal stops and raises _BoundsExceeded as
+    soon as any edge of the running box passes that length: callers that
+    only ask "is it bigger than X?" don't pay for the rest of the scene.
+    """
+    with open(glb_path, "rb") as f:
+        magic, _version, _length = struct.unpack("<4sII", f.read(12))
+        if magic != b"glTF":
+            raise ValueError("Not a binary glTF file")
+        chunk_length, chunk_type = struct.unpack("<II", f.read(8))
+        if chunk_type != 0x4E4F534A:  # b"JSON"
+            raise ValueError("First GLB chunk is not JSON")
+        gltf = json.loads(f.read(chunk_length))
+
+    running_lo: Optional[np.ndarray] = None
+    running_hi: Optional[np.ndarray] = None
+
+    def merge(box_lo: np.ndarray, box_hi: np.ndarray):
+        nonlocal running_lo, running_hi
+        if running_lo is None:
+            running_lo, running_hi = box_lo, box_hi
+        else:
+            running_lo = np.minimum(running_lo, box_lo)
+            running_hi = np.maximum(running_hi, box_hi)
+        if (
+            early_exit_edge is not None
+            and (running_hi - running_lo).max() > early_exit_edge
+        ):
+            lo, hi = running_lo, running_hi
+            raise _BoundsExceeded((lo[0], hi[0], lo[1], hi[1], lo[2], hi[2]))
+
+    def visit(node_index: int, parent_matrix: np.ndarray):
+        node = gltf["nodes"][node_index]
+        matrix = parent_matrix @ _node_matrix(node)
+        if "mesh" in node:
+            for primitive in gltf["meshes"][node["mesh"]].get("primitives", []):
+                accessor_index = primitive.get("attributes", {}).get("POSITION")
+                if accessor_index is None:
+                    continue
+                accessor = gltf["accessors"][accessor_index]
+                lo = np.array(accessor["min"], dtype=np.float64)
+                hi = np.array(accessor["max"], dtype=np.float64)
+                # Transform all 8 corners of the accessor box; axis-aligned
+                # boxes don't stay axis-aligned under rotation.
+                corners = np.array(
+                    [[x, y, z, 1.0] for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])]
+                )
+                world = (matrix @ corners.T).T[:, :3]
+                merge(world.min(axis=0), world.max(axis=0))
+        for child in node.get("children", []):
+            visit(child, matrix)
+
+    scene = gltf["scenes"][gltf.get("scene", 0)]
+    root_nodes = scene.get("nodes", [])
+
+    # Most exported assets are a flat list of untransformed nodes; for those
+    # the accessor boxes ARE the world boxes and all the matrix and corner
+    # work above is identity arithmetic.
+    _TRANSFORM_KEYS = ("matrix", "rotation", "scale", "translation", "children")
+    flat = all(
+        not any(key in gltf["nodes"][node_index] for key in _TRANSFORM_KEYS)
+        for node_index in root_nodes
+    )
+    if flat:
+        for node_index in root_nodes:
+            node = gltf["nodes"][node_index]
+            if "mesh" not in node:
+                continue
+            for primitive in gltf["meshes"][node["mesh"]].get("primitives", []):
+                accessor_index = primitive.get("attributes", {}).get("POSITION")
+                if accessor_index is None:
+                    continue
+                accessor = gltf["accessors"][accessor_index]
+                merge(
+                    np.array(accessor["min"], dtype=np.float64),
+                    np.array(accessor["max"], dtype=np.float64),
+                )
+    else:
+        for node_index in root_nodes:
+            visit(node_index, np.eye(4))
+
+    if running_lo is None:
+        raise ValueError("No POSITION accessors in scene")
+
+    lo, hi = running_lo, running_hi
+    return (lo[0], hi[0], lo[1], hi[1], lo[2], hi[2])
+
+
+# Bounds are immutable for a given file, so repeat validations and the
+# dimensions endpoint can reuse them; keyed by (path, size, mtime) so a
+# replaced file re-computes.
+_bounds_cache: dict[tuple, tuple] = {}
+_BOUNDS_CACHE_SIZE = 4096
+
+
+def get_glb_bounding_box(
+    glb_path: str, early_exit_edge: Optional[float] = None
+) -> tuple[bool, Optional[tuple], Optional[str]]:
+    """
+    Extract bounding box from a GLB file, caching results per file version.
+
+    Tries the accessor-metadata fast path first (microseconds of JSON
+    parsing); falls back to a full PyVista import for files it can't
+    handle.
 
     Args:
         glb_path: Path to the GLB file
+        early_exit_edge: Stop as soon as any bounding-box edge exceeds this
+            length; the returned bounds are then a lower bound on the true
+            box, which is all a size check needs.
 
     Returns:
         tuple: (success, bounds, error_message)
         bounds format: (xmin, xmax, ymin, ymax, zmin, zmax) or None if failed
     """
+    try:
+        stat = os.stat(glb_path)
+    except OSError as e:
+        return False, None, f"Error loading GLB file: {e}"
+    cache_key = (glb_path, stat.st_size, stat.st_mtime_ns)
+    cached = _bounds_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        result = _compute_glb_bounding_box(glb_path, early_exit_edge)
+    except _BoundsExceeded as exc:
+        # Truncated bounds prove the asset is oversized but aren't the true
+        # box, so they must never land in the cache.
+        return True, exc.bounds, None
+    if result[0]:
+        if len(_bounds_cache) >= _BOUNDS_CACHE_SIZE:
+            _bounds_cache.clear()
+        _bounds_cache[cache_key] = result
+    return result
+
+
+def _compute_glb_bounding_box(
+    glb_path: str, early_exit_edge: Optional[float] = None
+) -> tuple[bool, Optional[tuple], Optional[str]]:
+    try:
+        return True, _fast_glb_bounds(glb_path, early_exit_edge), None
+    except _BoundsExceeded:
+        raise
+    except Exception:
+        pass
+
+    # A truncated or non-GLB file will fail the VTK import too — check the
+    # 4-byte magic first so garbage doesn't cost a render-window spin-up.
+    try:
+        with open(glb_path, "rb") as f:
+            if f.read(4) != b"glTF":
+                return False, None, "Not a binary glTF file"
+    except OSError as e:
+        return False, None, f"Error loading GLB file: {e}"
+
     try:
         plotter = pv.Plotter(off_screen=True)
         plotter.import_gltf(glb_path)
@@ -47,18 +239,22 @@ def calc_dimensions_from_bounds(bounds: tuple) -> tuple[float, float, float]:
     return x_size, y_size, z_size
 
 
-def get_glb_dimensions(glb_path: str) -> tuple[bool, Optional[tuple], Optional[str]]:
+def get_glb_dimensions(
+    glb_path: str, early_exit_edge: Optional[float] = None
+) -> tuple[bool, Optional[tuple], Optional[str]]:
     """
     Get GLB dimensions directly.
 
     Args:
         glb_path: Path to the GLB file
+        early_exit_edge: See get_glb_bounding_box; only pass this when the
+            caller solely compares dimensions against the same threshold.
 
     Returns:
         tuple: (success, dimensions, error_message)
         dimensions format: (x_size, y_size, z_size) or None if failed
     """
-    success, bounds, error = get_glb_bounding_box(glb_path)
+    success, bounds, error = get_glb_bounding_box(glb_path, early_exit_edge)
 
     if not success:
         return False, None, error
@@ -67,17 +263,20 @@ def get_glb_dimensions(glb_path: str) -> tuple[bool, Optional[tuple], Optional[s
     return True, dimensions, None
 
 
-def get_max_dimension(glb_path: str) -> tuple[bool, Optional[float], Optional[str]]:
+def get_max_dimension(
+    glb_path: str, early_exit_edge: Optional[float] = None
+) -> tuple[bool, Optional[float], Optional[str]]:
     """
     Get the maximum dimension (edge length) of a GLB file.
 
     Args:
         glb_path: Path to the GLB file
+        early_exit_edge: See get_glb_bounding_box.
 
     Returns:
         tuple: (success, max_dimension, error_message)
     """
-    success, dimensions, error = get_glb_dimensions(glb_path)
+    success, dimensions, error = get_glb_dimensions(glb_path, early_exit_edge)
 
     if not success:
         return False, None, error
@@ -1,10 +1,37 @@
 import os
-import sys
+import threading
 
 import pyvista as pv
 
 from graphics_db_server.logging import logger
 
+# One plotter per worker thread/process, reused across calls: the off-screen
+# render window and its OpenGL context are the expensive part of a thumbnail,
+# not the per-file import.
+_local = threading.local()
+
+
+def _get_plotter(resolution: int) -> pv.Plotter:
+    plotter = getattr(_local, "plotter", None)
+    if plotter is None or getattr(_local, "resolution", None) != resolution:
+        if plotter is not None:
+            plotter.close()
+        plotter = pv.Plotter(off_screen=True, window_size=[resolution, resolution])
+        # The axes widget survives clear(), so add it once per plotter.
+        plotter.add_axes()
+        _local.plotter = plotter
+        _local.resolution = resolution
+    else:
+        plotter.clear()
+    return plotter
+
+
+def _drop_plotter():
+    plotter = getattr(_local, "plotter", None)
+    if plotter is not None:
+        plotter.close()
+        _local.plotter = None
+
 
 def generate_thumbnail_from_glb(glb_path, output_path, resolution, overwrite=False):
     """
@@ -23,13 +50,13 @@ def generate_thumbnail_from_glb(glb_path, output_path, resolution, overwrite=Fal
         )
         return
 
-    print(
+    logger.debug(
         f"Processing: {os.path.basename(glb_path)} -> {os.path.basename(output_path)}"
     )
 
     try:
-        # Set up the plotter for off-screen rendering
-        plotter = pv.Plotter(off_screen=True, window_size=[resolution, resolution])
+        # Reuse the per-thread off-screen plotter, cleared of the last scene
+        plotter = _get_plotter(resolution)
 
         # Directly import GLTF/GLB
         plotter.import_gltf(glb_path)
@@ -37,19 +64,12 @@ def generate_thumbnail_from_glb(glb_path, output_path, resolution, overwrite=Fal
         # Set the camera to an isometric view for a good default angle
         plotter.view_vector(vector=[1, 1, 1], viewup=[0, 1, 0])
 
-        # Optional: add XYZ axes annotation gizmo
-        plotter.add_axes()
-
         # Take a screenshot and save it
         plotter.screenshot(output_path, transparent_background=True)
 
-        # Clean up and close the plotter to free memory
-        plotter.close()
-
-        print(f"SUCCESS: Created thumbnail {os.path.basename(output_path)}")
+        logger.debug(f"Created thumbnail {os.path.basename(output_path)}")
 
     except Exception as e:
-        print(
-            f"ERROR: Could not process {os.path.basename(glb_path)}. Reason: {e}",
-            file=sys.stderr,
-        )
+        # Don't reuse a plotter that failed mid-render; its state is suspect.
+        _drop_plotter()
+        logger.error(f"Could not process {os.path.basename(glb_path)}. Reason: {e}")
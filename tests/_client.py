@@ -0,0 +1,7 @@
+import requests
+
+BASE_URL = "http://localhost:2692"
+
+# One shared session so the tests reuse a keep-alive connection instead of
+# opening a fresh TCP socket per request.
+SESSION = requests.Session()
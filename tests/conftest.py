@@ -0,0 +1,22 @@
+import pytest
+
+from _client import BASE_URL, SESSION
+
+
+def search_assets(query_text: str) -> list[dict]:
+    """Runs a search against the live server and returns the decoded results."""
+    response = SESSION.get(
+        f"{BASE_URL}/api/v0/assets/search",
+        params={"query": query_text},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.fixture(scope="session")
+def blue_car_search_results() -> list[dict]:
+    """
+    Search results for "a blue car", fetched once and shared by every test
+    that needs a known-good set of asset UIDs.
+    """
+    return search_assets("a blue car")
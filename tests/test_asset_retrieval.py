@@ -1,23 +1,15 @@
-import requests
-
 from src.graphics_db_server.logging import logger
 
 
-def test_asset_search(query_text: str):
+def test_asset_search(blue_car_search_results):
     """
     Tests graphics asset semantic search functionality.
     """
-    response = requests.get(
-        "http://localhost:2692/api/v0/assets/search",
-        params={"query": query_text},
-    )
-    logger.info(f"Query: {query_text}. Response: {response}")
-    assert response.status_code == 200
-    response_json = response.json()
-    assert len(response_json) > 0
-    return response_json
-
+    logger.info(f"Query: a blue car. Results: {len(blue_car_search_results)}")
+    assert len(blue_car_search_results) > 0
 
 
 if __name__ == "__main__":
-    test_asset_search("a blue car")
+    from conftest import search_assets
+
+    test_asset_search(search_assets("a blue car"))
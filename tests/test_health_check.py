@@ -1,13 +1,12 @@
-import requests
-
 from src.graphics_db_server.logging import logger
+from _client import BASE_URL, SESSION
 
 
 def test_health_check():
     """
     Tests that the healthcheck endpoint works.
     """
-    response = requests.get("http://localhost:2692/healthcheck")
+    response = SESSION.get(f"{BASE_URL}/healthcheck")
     logger.info(f"Healthcheck response: {response.json()}")
     assert response.status_code == 200
     assert response.json()["status"] == "ok"
@@ -1,39 +1,38 @@
-import requests
-import base64
-
 import io
 
 from PIL import Image
 
 from src.graphics_db_server.logging import logger
-from test_asset_retrieval import test_asset_search
+from _client import BASE_URL, SESSION
 
 
-def test_thumbnail_retrieval():
+def test_thumbnail_retrieval(blue_car_search_results):
     """
     Tests getting asset thumbnails.
     """
-    search_results = test_asset_search("a blue car")
-    asset_uids = [asset["uid"] for asset in search_results]
+    asset_uids = [asset["uid"] for asset in blue_car_search_results]
 
-    response = requests.post(
-        "http://localhost:2692/api/v0/assets/thumbnails",
+    response = SESSION.post(
+        f"{BASE_URL}/api/v0/assets/thumbnails",
         json={"asset_uids": asset_uids},
     )
     logger.info(f"Asset UIDs: {asset_uids}. Response: {response}")
     assert response.status_code == 200
     response_json = response.json()
     assert len(response_json) > 0
-    for uid, image_data in response_json.items():
+    for uid, thumbnail_url in response_json.items():
         assert uid in asset_uids
-        # Check if the image data is a valid base64 string
-        decoded_image = base64.b64decode(image_data)
-        assert decoded_image
+
+        # Fetch the raw image bytes from the per-asset thumbnail endpoint
+        image_response = SESSION.get(f"{BASE_URL}{thumbnail_url}")
+        assert image_response.status_code == 200
 
         # Load the image data into a PIL image
-        image = Image.open(io.BytesIO(decoded_image))
+        image = Image.open(io.BytesIO(image_response.content))
         assert image
 
 
 if __name__ == "__main__":
-    test_thumbnail_retrieval()
+    from conftest import search_assets
+
+    test_thumbnail_retrieval(search_assets("a blue car"))